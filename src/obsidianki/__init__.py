@@ -1 +1,5 @@
 __version__ = "0.0.1"
+
+from obsidianki.api import CARD_COLUMNS, convert_vault, iter_cards, iter_cards_text
+
+__all__ = ["CARD_COLUMNS", "convert_vault", "iter_cards", "iter_cards_text"]
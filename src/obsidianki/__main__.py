@@ -1,76 +1,11 @@
 import argparse
-import json
 import os
-import random
-import re
+import pathlib
+import sys
 
-import pandas as pd
-from markdown2 import markdown
-
-from obsidianki.convert import (
-    convert_math,
-    extract_flashcard_blocks,
-    find_dollar_math_substrings,
-    get_flashcard_fields,
-)
-from obsidianki.my_emoji import EMOJI
-
-
-def protect_urls(md: str) -> str:
-    """Wrap bare URLs in angle brackets to stop underscore parsing."""
-    url_pattern = re.compile(
-        r"(?<![\(<\[])" r"(https?://[^\s<>\]\)]+)",  # not already in (), <>, or []
-        re.IGNORECASE,
-    )
-    return url_pattern.sub(r"<\1>", md)
-
-
-def remove_backticks_language(value: str) -> str:
-    """
-    Remove any language name from fenced code blocks
-    """
-    return re.sub(r"```[^\n]*", "```", value)
-
-
-def convert_flashcard_block(fields: dict[str, str]) -> dict[str, str]:
-    """
-    Turn a markdown flashcard block into HTML.
-    """
-    for key, value in fields.items():
-        value = value.strip()
-        if not value:
-            continue
-
-        if key in ("Q", "A", "X"):
-            substrings = find_dollar_math_substrings(value)
-
-            math_blocks = []
-            for start, end in substrings:
-                converted_math = convert_math(value[start:end])
-                math_blocks.append(converted_math)
-
-            # Replace substrings with '{MATHPLACEHOLDER}'
-
-            for start, end in reversed(substrings):
-                value = value[:start] + "{MATHPLACEHOLDER}" + value[end:]
-
-            html_content = markdown(
-                protect_urls(value),
-                extras=[
-                    "break-on-newline",
-                    "tables",
-                    "cuddled-lists",
-                    "fenced-code-blocks",
-                ],
-            )
-
-            # Replace '{MATHPLACEHOLDER}' with math blocks
-            for math_block in math_blocks:
-                html_content = html_content.replace("{MATHPLACEHOLDER}", math_block, 1)
-
-            fields[key] = html_content
-
-    return fields
+from obsidianki.api import CHECKMARK, iter_cards
+from obsidianki.convert import DIALECTS
+from obsidianki.writers import CsvWriter, JsonWriter, check_output_path, open_writer, write_cards
 
 
 def main():
@@ -79,97 +14,81 @@ def main():
     # parser.add_argument(
     #     "output_file", nargs="?", default="", help="Output Anki-compatible file"
     # )
-    parser.add_argument("--json", action="store_true", help="Output as JSON instead of json")
+    parser.add_argument("--json", action="store_true", help="Print JSON to stdout instead of CSV")
     parser.add_argument(
         "--all",
         action="store_true",
         help="Output cards with a checkmark in the question (they will be omitted by default)",
     )
+    parser.add_argument(
+        "--dialect",
+        choices=DIALECTS,
+        help="Note format of the input file. Detected from the file contents by default.",
+    )
     parser.add_argument(
         "-o",
         "--output-file",
         nargs="?",
+        action="append",
         const="",  # If user passes --output-file without filename, const="" triggers
         help=(
             "Output Anki-compatible file. If no filename given, defaults to input filename with .csv extension. "
-            "If omitted, prints to stdout."
+            "The format is chosen from the extension (.csv, .json or .apkg). May be given several times to write "
+            "several formats in one pass. If omitted, prints to stdout."
         ),
     )
     args = parser.parse_args()
 
-    with open(args.input_file, "r", encoding="utf-8") as f:
-        obsidian_text = f.read()
-
-    blocks = extract_flashcard_blocks(obsidian_text)
-
-    card_dicts: list[dict[str, str]] = []
-
-    default_block = {"Q": "", "A": "", "X": "", "R": "", "C": "", "P": ""}
-    for block in blocks:
-        fields = get_flashcard_fields(block, default_block)
-
-        # Always carry over reference, chapter and page
-        carryover_keys = ("X", "R", "C", "P")
-        default_block = {key: fields[key] for key in carryover_keys if key in fields}
-
-        card_dict = convert_flashcard_block(fields)
-
-        extra = card_dict.get("X", "").strip()
-
-        if extra:
-            # I used to add two newlines around the emoji, but my output has <p> and
-            # doesn't seem to need extra space.
-            card_dict["A"] = card_dict.get("A", "") + random.choice(EMOJI) + extra
-
-        card_dicts.append(card_dict)
-
-    df = pd.DataFrame(card_dicts, columns=["Q", "A", "R", "C", "P"])
+    output_files = []
+    resolved_files = set()
+    for output_file in args.output_file or []:
+        if output_file == "":
+            base, ext = os.path.splitext(args.input_file)
+            output_file = f"{base}.csv"
+        try:
+            check_output_path(output_file)
+        except ValueError as e:
+            parser.error(str(e))
 
-    df.rename(
-        columns={
-            "Q": "Front",
-            "A": "Back",
-            "R": "Reference",
-            "C": "Chapter",
-            "P": "Page",
-        },
-        inplace=True,
-    )
-    df = df[["Front", "Back", "Reference", "Chapter", "Page"]]
+        # Two writers for one file would clash over the same temporary file.
+        resolved = pathlib.Path(output_file).resolve()
+        if resolved in resolved_files:
+            parser.error(f"Output file {output_file} is given more than once")
+        resolved_files.add(resolved)
 
-    if not args.all:
-        df.query("~Front.str.contains('✅')", inplace=True)
+        output_files.append(output_file)
 
-    if args.output_file is None:
-        # Don't put the header in the file because Anki will make a flashcard out of it.
+    writers = []
+    try:
+        for output_file in output_files:
+            writers.append(open_writer(output_file))
 
         if args.json:
-            # Convert to JSON format
-
-            # pretty-print json
-            # json_data = df.to_json(orient="records", indent=4)
-            # compact json
-            # json_data = df.to_json(orient="records", indent=None)
-
-            json_str = json.dumps(df.to_dict(orient="records"), indent=4)
-
-            print(json_str)
-            # with open(args.output_file, "w", encoding="utf-8") as f:
-            #     f.write(json_data)
-        else:
-            print(df.to_csv(index=False, header=True))
-    else:
-        assert not args.json
-
-        if args.output_file == "":
-            base, ext = os.path.splitext(args.input_file)
-            args.output_file = f"{base}.csv"
-            df.to_csv(args.output_file, index=False, header=False)
+            writers.append(JsonWriter(sys.stdout))
+        elif not output_files:
+            writers.append(CsvWriter(sys.stdout, header=True))
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+
+    card_count = 0
+
+    def count_and_filter(cards):
+        nonlocal card_count
+        for card in cards:
+            card_count += 1
+            if args.all or CHECKMARK not in card["Front"]:
+                yield card
+
+    # Render the cards once and stream them to every output.
+    cards = iter_cards(pathlib.Path(args.input_file), include_checked=True, dialect=args.dialect)
+    output_count = write_cards(count_and_filter(cards), writers)
 
     print()
     print("SUMMARY:")
-    print(f"Found {len(card_dicts)} cards.")
-    print(f"Output {len(df)} records.")
+    print(f"Found {card_count} cards.")
+    print(f"Output {output_count} records.")
 
 
 if __name__ == "__main__":
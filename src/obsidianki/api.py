@@ -0,0 +1,152 @@
+"""
+Library entry points for embedding obsidianki without going through the CLI.
+
+Cards are yielded lazily as dicts keyed by CARD_COLUMNS, the same records the CLI writes out.
+"""
+
+import os
+import pathlib
+import random
+from collections.abc import Iterator
+
+from obsidianki.convert import iter_flashcard_fields
+from obsidianki.my_emoji import load_emoji
+from obsidianki.render import convert_flashcard_block
+
+CARD_COLUMNS = ("Front", "Back", "Reference", "Chapter", "Page")
+
+# Map from internal field names to output columns
+_FIELD_COLUMNS = {"Q": "Front", "A": "Back", "R": "Reference", "C": "Chapter", "P": "Page"}
+
+CHECKMARK = "✅"
+
+
+def iter_cards(
+    path: str | os.PathLike,
+    *,
+    include_checked: bool = False,
+    dialect: str | None = None,
+    rng: random.Random | None = None,
+) -> Iterator[dict[str, str]]:
+    """
+    Yield rendered card records from a markdown file. Use iter_cards_text for markdown in a string.
+
+    Args:
+        path: markdown file to read
+        include_checked: also yield cards with a checkmark in the question, like the CLI's --all
+        dialect: "flashcard" or "legacy" note format, or None to detect it from the text
+        rng: random number generator used to pick the emoji separating the answer from the extra
+    Returns:
+        iterator over dicts with keys CARD_COLUMNS
+    """
+    text = pathlib.Path(path).read_text(encoding="utf-8")
+    return iter_cards_text(text, include_checked=include_checked, dialect=dialect, rng=rng)
+
+
+def iter_cards_text(
+    text: str,
+    *,
+    include_checked: bool = False,
+    dialect: str | None = None,
+    rng: random.Random | None = None,
+) -> Iterator[dict[str, str]]:
+    """
+    Yield rendered card records from markdown text. Takes the same options as iter_cards.
+    """
+    for record in _iter_all_cards(text, dialect, rng):
+        if include_checked or CHECKMARK not in record["Front"]:
+            yield record
+
+
+def convert_vault(
+    root: str | os.PathLike,
+    *,
+    include_checked: bool = False,
+    dialect: str | None = None,
+    rng: random.Random | None = None,
+    workers: int | None = None,
+) -> Iterator[tuple[pathlib.Path, dict[str, str]]]:
+    """
+    Yield rendered card records from every markdown file under root.
+
+    Each directory's files are visited in name order before its subdirectories, which are also
+    visited in name order. Carry-over fields are reset at the start of each file.
+    Hidden directories such as .obsidian and .trash are skipped. Unless dialect is given, it is
+    detected separately for each file, so vaults mixing note formats convert in one run.
+
+    Args:
+        workers: if greater than 1, convert files in that many worker processes. Records are
+            still yielded in file order.
+    Returns:
+        iterator over (path, record) pairs, where record is as returned by iter_cards
+    """
+    paths = list(iter_markdown_files(pathlib.Path(root)))
+
+    # Give each file its own seed, so the emoji don't depend on how files are split between workers.
+    seeds = [rng.getrandbits(64) if rng is not None else None for _ in paths]
+
+    if workers is None or workers <= 1:
+        for path, seed in zip(paths, seeds):
+            file_rng = random.Random(seed) if seed is not None else None
+            for record in iter_cards(path, include_checked=include_checked, dialect=dialect, rng=file_rng):
+                yield path, record
+        return
+
+    # Imported here because multiprocessing is slow to import and most callers don't need it.
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        file_records = executor.map(
+            _convert_file,
+            paths,
+            [include_checked] * len(paths),
+            [dialect] * len(paths),
+            seeds,
+        )
+        for path, records in zip(paths, file_records):
+            for record in records:
+                yield path, record
+
+
+def _convert_file(
+    path: pathlib.Path, include_checked: bool, dialect: str | None, seed: int | None
+) -> list[dict[str, str]]:
+    """
+    Convert one file in a worker process.
+    """
+    rng = random.Random(seed) if seed is not None else None
+    return list(iter_cards(path, include_checked=include_checked, dialect=dialect, rng=rng))
+
+
+def _iter_all_cards(text: str, dialect: str | None, rng: random.Random | None) -> Iterator[dict[str, str]]:
+    """
+    Yield every card in the text, including checked ones.
+    """
+    chooser = rng if rng is not None else random
+
+    for fields in iter_flashcard_fields(text, dialect):
+        card_dict = convert_flashcard_block(fields)
+
+        extra = card_dict.get("X", "").strip()
+
+        if extra:
+            card_dict["A"] = card_dict.get("A", "") + chooser.choice(load_emoji()) + extra
+
+        yield {column: card_dict.get(key, "") for key, column in _FIELD_COLUMNS.items()}
+
+
+def iter_markdown_files(root: pathlib.Path) -> Iterator[pathlib.Path]:
+    """
+    Yield the markdown files under root, or root itself if it is a file.
+
+    Hidden directories are skipped. Each directory's files come in name order before its subdirectories.
+    """
+    if root.is_file():
+        yield root
+        return
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if filename.endswith(".md"):
+                yield pathlib.Path(dirpath) / filename
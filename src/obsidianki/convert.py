@@ -1,11 +1,41 @@
 import html
 import re
+from collections.abc import Iterator
 
 
 class FlashcardExtractionError(Exception):
     pass
 
 
+# Scanners shared by both dialects, compiled once at import.
+
+# Field tags inside a :flashcard: block
+FIELD_PATTERN = re.compile(r"^(A|Answer|X|Extra|R|Reference|Book|C|Chapter|P|Page):", re.MULTILINE)
+
+# Section tags of the legacy Q:/A: format, optionally checked off and wrapped in emphasis, e.g. "✅ **Q**:"
+LEGACY_TAG_PATTERN = re.compile(r"^\s*(✅)?\s*[*_]*([A-Za-z ]+)[*_]*\s*:[*_]*", re.MULTILINE)
+
+# The starting token of a :flashcard: block
+FLASHCARD_START_PATTERN = re.compile(r"^:flashcard:\r?$", re.MULTILINE)
+
+# Math delimiters $, $$, { and }
+MATH_DELIM_PATTERN = re.compile(r"(\$+|[{}])", re.MULTILINE)
+
+DIALECTS = ("flashcard", "legacy")
+
+# Map from legacy tags to flashcard fields. Tags maps to None and is dropped.
+LEGACY_TAGS = {
+    "Q": "Q",
+    "A": "A",
+    "AA": "X",
+    "Addendum": "X",
+    "Book": "R",
+    "Chapter": "C",
+    "Page": "P",
+    "Tags": None,
+}
+
+
 def extract_flashcard_blocks(text: str, strip: bool = True) -> list[str]:
     """
     Extract flashcard blocks from the given text.
@@ -55,9 +85,7 @@ def get_flashcard_fields(text: str, defaults: dict[str, str] | None = None) -> d
     carryover_fields = ("R", "C", "P")
     fields = {**{key: defaults[key] for key in carryover_fields if key in defaults}}
 
-    field_pattern = re.compile(r"^(A|Answer|X|Extra|R|Reference|Book|C|Chapter|P|Page):", re.MULTILINE)
-
-    matches = list(field_pattern.finditer(text))
+    matches = list(FIELD_PATTERN.finditer(text))
 
     starts = [0] + [match.end() for match in matches]
     ends = [match.start() for match in matches] + [len(text)]
@@ -90,6 +118,86 @@ def get_flashcard_fields(text: str, defaults: dict[str, str] | None = None) -> d
     return fields
 
 
+def detect_dialect(text: str) -> str:
+    """
+    Guess which note format the text is written in.
+
+    Returns:
+        "flashcard" if the text has :flashcard: blocks, "legacy" if it has Q: sections, and
+        "flashcard" otherwise (which will find no cards).
+    """
+    if FLASHCARD_START_PATTERN.search(text):
+        return "flashcard"
+    if any(match.group(2) == "Q" for match in LEGACY_TAG_PATTERN.finditer(text)):
+        return "legacy"
+    return "flashcard"
+
+
+def extract_legacy_fields(text: str) -> list[dict[str, str]]:
+    """
+    Split a note in the legacy Q:/A:/AA:/Book:/Chapter:/Page:/Tags: format into flashcard fields.
+
+    Each Q: starts a new card. Book, Chapter and Page carry over to later cards until they are
+    given again. A checkmark before Q: is moved into the question, so it's filtered like a
+    checked :flashcard: block.
+
+    Returns:
+        list of dicts with the same keys as get_flashcard_fields
+    """
+    matches = [m for m in LEGACY_TAG_PATTERN.finditer(text) if m.group(2) in LEGACY_TAGS]
+
+    carryover: dict[str, str] = {}
+    cards: list[dict[str, str]] = []
+
+    for idx, match in enumerate(matches):
+        checked, tag = match.groups()
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(text)
+        content = text[match.end() : end].strip()
+
+        field = LEGACY_TAGS[tag]
+        if field is None:
+            continue
+
+        if field == "Q":
+            if checked:
+                content = f"{checked} {content}"
+            cards.append({**carryover, "Q": content})
+        else:
+            if field in ("R", "C", "P"):
+                carryover[field] = content
+            if cards:
+                cards[-1][field] = content
+
+    return cards
+
+
+def iter_flashcard_fields(text: str, dialect: str | None = None) -> Iterator[dict[str, str]]:
+    """
+    Yield the fields of each card in the text, with carry-over fields filled in.
+
+    Args:
+        text: text of a Markdown file
+        dialect: "flashcard" or "legacy", or None to detect it from the text
+    """
+    if dialect is None:
+        dialect = detect_dialect(text)
+
+    if dialect == "legacy":
+        yield from extract_legacy_fields(text)
+    elif dialect == "flashcard":
+        default_block = {"Q": "", "A": "", "X": "", "R": "", "C": "", "P": ""}
+        for block in extract_flashcard_blocks(text):
+            fields = get_flashcard_fields(block, default_block)
+
+            # Always carry over reference, chapter and page
+            carryover_keys = ("X", "R", "C", "P")
+            default_block = {key: fields[key] for key in carryover_keys if key in fields}
+
+            yield fields
+    else:
+        raise ValueError(f"Unknown dialect {dialect!r}, expected one of {DIALECTS}")
+
+
 def find_dollar_math_substrings(text: str) -> list[tuple[int, int]]:
     r"""
     Find all substrings in the section that are delimited by $ or $$.
@@ -100,10 +208,7 @@ def find_dollar_math_substrings(text: str) -> list[tuple[int, int]]:
         list of start and end indices
     """
 
-    # This regex matches $, $$, {, and }.
-    delim_pattern = re.compile(r"(\$+|[{}])", re.MULTILINE)
-
-    delims = list(delim_pattern.finditer(text))
+    delims = list(MATH_DELIM_PATTERN.finditer(text))
 
     if not delims:
         return []
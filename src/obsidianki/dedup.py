@@ -0,0 +1,280 @@
+"""
+Find duplicate and near-duplicate cards across a vault.
+
+Exact duplicates share a hash of their normalized text. Near-duplicates are found with MinHash
+signatures over character shingles, bucketed by locality-sensitive hashing (LSH) so that only
+cards sharing a bucket are compared. Signatures are kept in an index that can be saved to disk
+and updated as notes change, re-parsing only files whose contents differ.
+"""
+
+import hashlib
+import json
+import os
+import pathlib
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+
+from obsidianki.api import iter_markdown_files
+from obsidianki.convert import FlashcardExtractionError, iter_flashcard_fields
+
+INDEX_VERSION = 1
+
+# Signature length is BANDS * ROWS. Cards are candidates if they agree on every row of some band,
+# which is likely once their Jaccard similarity is above roughly (1 / BANDS) ** (1 / ROWS).
+BANDS = 16
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+SHINGLE_SIZE = 5
+
+# Each "permutation" XORs the 64-bit shingle hashes with a fixed random mask. This is much cheaper
+# than a universal hash family in pure Python. The masks are fixed so signatures stay comparable
+# between runs.
+_MASKS = [
+    int.from_bytes(hashlib.blake2b(f"mask{idx}".encode(), digest_size=8).digest(), "little") for idx in range(NUM_PERM)
+]
+
+_MARKUP_PATTERN = re.compile(r"[$*_`#>\[\](){}\\|~=]|✅")
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@dataclass
+class CardFingerprint:
+    """
+    Hashes of one card, and enough information to find it again.
+    """
+
+    path: str
+    index: int  # position of the card in its file
+    question: str
+    exact_hash: str
+    signature: list[int]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase the text and strip markdown, math delimiters, punctuation and extra whitespace.
+    """
+    text = _MARKUP_PATTERN.sub(" ", text.lower())
+    text = _NON_WORD_PATTERN.sub("", text)
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def exact_hash(text: str) -> str:
+    """
+    Hash of the normalized text.
+    """
+    return hashlib.blake2b(normalize_text(text).encode(), digest_size=16).hexdigest()
+
+
+def minhash_signature(text: str) -> list[int]:
+    """
+    MinHash signature of the character shingles of the normalized text.
+    """
+    normalized = normalize_text(text)
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[idx : idx + SHINGLE_SIZE] for idx in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+    hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little") for s in shingles]
+
+    return [min([h ^ mask for h in hashes]) for mask in _MASKS]
+
+
+def estimate_similarity(signature1: list[int], signature2: list[int]) -> float:
+    """
+    Estimate the Jaccard similarity of the shingle sets from two MinHash signatures.
+    """
+    return sum(x == y for x, y in zip(signature1, signature2)) / len(signature1)
+
+
+def fingerprint_fields(
+    fields: dict[str, str], path: str, index: int, keys: tuple[str, ...] = ("Q", "A")
+) -> CardFingerprint:
+    """
+    Fingerprint a card from the fields returned by get_flashcard_fields.
+    """
+    text = "\n".join(fields.get(key, "") for key in keys)
+    return CardFingerprint(
+        path=path,
+        index=index,
+        question=fields.get("Q", ""),
+        exact_hash=exact_hash(text),
+        signature=minhash_signature(text),
+    )
+
+
+class DuplicateIndex:
+    """
+    Fingerprints of every card in a vault, grouped by file.
+
+    Args:
+        keys: card fields to compare, by default the question and answer together
+    """
+
+    def __init__(self, keys: tuple[str, ...] = ("Q", "A")):
+        self.keys = keys
+        self.files: dict[str, tuple[str, list[CardFingerprint]]] = {}  # path -> (content hash, cards)
+        self.errors: dict[str, str] = {}  # path -> error, for files skipped by the last update_vault
+
+    def update_file(self, path: str | os.PathLike, text: str | None = None) -> bool:
+        """
+        Re-fingerprint one file if its contents changed.
+
+        Returns:
+            True if the file was re-parsed
+        """
+        path = pathlib.Path(path)
+        if text is None:
+            text = path.read_text(encoding="utf-8")
+
+        content_hash = hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+        key = str(path)
+        if key in self.files and self.files[key][0] == content_hash:
+            return False
+
+        cards = [
+            fingerprint_fields(fields, key, idx, self.keys) for idx, fields in enumerate(iter_flashcard_fields(text))
+        ]
+        self.files[key] = (content_hash, cards)
+        return True
+
+    def remove_file(self, path: str | os.PathLike) -> None:
+        """
+        Drop a file's cards from the index.
+        """
+        self.files.pop(str(path), None)
+
+    def update_vault(self, root: str | os.PathLike) -> list[str]:
+        """
+        Bring the index up to date with the markdown files under root, dropping files that are gone.
+
+        Files that can't be read or parsed are skipped and listed in self.errors. Their previous
+        fingerprints, if any, are kept.
+
+        Returns:
+            paths of the files that were re-parsed
+        """
+        seen = set()
+        updated = []
+        self.errors = {}
+        for path in iter_markdown_files(pathlib.Path(root)):
+            seen.add(str(path))
+            try:
+                if self.update_file(path):
+                    updated.append(str(path))
+            except (FlashcardExtractionError, UnicodeDecodeError, OSError) as e:
+                self.errors[str(path)] = str(e)
+
+        for key in list(self.files):
+            if key not in seen:
+                del self.files[key]
+
+        return updated
+
+    def cards(self) -> list[CardFingerprint]:
+        return [card for _, cards in self.files.values() for card in cards]
+
+    def clusters(self, threshold: float = 0.7) -> list[list[CardFingerprint]]:
+        """
+        Group cards that are exact duplicates or whose estimated similarity is at least threshold.
+
+        Each card is compared with at most one other card per LSH band, so this runs in linear time
+        in the number of cards.
+
+        Returns:
+            clusters of two or more cards, largest first
+        """
+        cards = self.cards()
+
+        parent = list(range(len(cards)))
+
+        def find(idx: int) -> int:
+            while parent[idx] != idx:
+                parent[idx] = parent[parent[idx]]
+                idx = parent[idx]
+            return idx
+
+        def union(idx1: int, idx2: int) -> None:
+            parent[find(idx1)] = find(idx2)
+
+        # Exact duplicates are merged up front, and only one representative of each goes into the
+        # LSH buckets, so many identical cards don't make a bucket expensive.
+        representatives: dict[str, int] = {}
+        for idx, card in enumerate(cards):
+            if card.exact_hash in representatives:
+                union(idx, representatives[card.exact_hash])
+            else:
+                representatives[card.exact_hash] = idx
+
+        # Each band keeps the first card that landed in each bucket. Later cards are compared only
+        # against that one, so each card costs at most one comparison per band.
+        for band in range(BANDS):
+            bucket_firsts: dict[tuple[int, ...], int] = {}
+            for idx in representatives.values():
+                key = tuple(cards[idx].signature[band * ROWS : (band + 1) * ROWS])
+                first = bucket_firsts.setdefault(key, idx)
+                if first == idx or find(first) == find(idx):
+                    continue
+                if estimate_similarity(cards[first].signature, cards[idx].signature) >= threshold:
+                    union(first, idx)
+
+        groups: dict[int, list[CardFingerprint]] = defaultdict(list)
+        for idx, card in enumerate(cards):
+            groups[find(idx)].append(card)
+
+        return sorted((group for group in groups.values() if len(group) > 1), key=len, reverse=True)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Save the index as JSON. The file is replaced in one step, so a crash can't leave it half written.
+        """
+        path = pathlib.Path(path)
+        data = {
+            "version": INDEX_VERSION,
+            "keys": list(self.keys),
+            "files": {
+                key: {"hash": content_hash, "cards": [card.__dict__ for card in cards]}
+                for key, (content_hash, cards) in self.files.items()
+            },
+        }
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike, keys: tuple[str, ...] | None = None) -> "DuplicateIndex":
+        """
+        Load a saved index. Returns an empty index if the file is missing, unreadable, from another
+        version, or was built from different keys.
+
+        Args:
+            keys: card fields to compare, or None to use the saved ones (or the default for a new index)
+        """
+        path = pathlib.Path(path)
+        empty = cls() if keys is None else cls(keys=keys)
+        if not path.exists():
+            return empty
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION:
+                return empty
+
+            saved_keys = tuple(data["keys"])
+            if keys is not None and saved_keys != tuple(keys):
+                return empty
+
+            index = cls(keys=saved_keys)
+            for key, entry in data["files"].items():
+                index.files[key] = (entry["hash"], [CardFingerprint(**card) for card in entry["cards"]])
+        except (ValueError, KeyError, TypeError, AttributeError):
+            # ValueError covers JSONDecodeError and UnicodeDecodeError
+            return empty
+        return index
@@ -1,6 +1,8 @@
+import functools
 import importlib.resources
 
 
+@functools.cache
 def load_emoji():
     # Use importlib.resources to load the resource from the package
     with importlib.resources.open_text("obsidianki", "good_mac_emoji.txt") as file:
@@ -8,4 +10,8 @@ def load_emoji():
     return ee
 
 
-EMOJI = load_emoji()
+def __getattr__(name: str):
+    # Load EMOJI on first access so importing the package doesn't touch the filesystem.
+    if name == "EMOJI":
+        return load_emoji()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,62 @@
+import re
+
+from markdown2 import markdown
+
+from obsidianki.convert import convert_math, find_dollar_math_substrings
+
+
+def protect_urls(md: str) -> str:
+    """Wrap bare URLs in angle brackets to stop underscore parsing."""
+    url_pattern = re.compile(
+        r"(?<![\(<\[])" r"(https?://[^\s<>\]\)]+)",  # not already in (), <>, or []
+        re.IGNORECASE,
+    )
+    return url_pattern.sub(r"<\1>", md)
+
+
+def remove_backticks_language(value: str) -> str:
+    """
+    Remove any language name from fenced code blocks
+    """
+    return re.sub(r"```[^\n]*", "```", value)
+
+
+def convert_flashcard_block(fields: dict[str, str]) -> dict[str, str]:
+    """
+    Turn a markdown flashcard block into HTML.
+    """
+    for key, value in fields.items():
+        value = value.strip()
+        if not value:
+            continue
+
+        if key in ("Q", "A", "X"):
+            substrings = find_dollar_math_substrings(value)
+
+            math_blocks = []
+            for start, end in substrings:
+                converted_math = convert_math(value[start:end])
+                math_blocks.append(converted_math)
+
+            # Replace substrings with '{MATHPLACEHOLDER}'
+
+            for start, end in reversed(substrings):
+                value = value[:start] + "{MATHPLACEHOLDER}" + value[end:]
+
+            html_content = markdown(
+                protect_urls(value),
+                extras=[
+                    "break-on-newline",
+                    "tables",
+                    "cuddled-lists",
+                    "fenced-code-blocks",
+                ],
+            )
+
+            # Replace '{MATHPLACEHOLDER}' with math blocks
+            for math_block in math_blocks:
+                html_content = html_content.replace("{MATHPLACEHOLDER}", math_block, 1)
+
+            fields[key] = html_content
+
+    return fields
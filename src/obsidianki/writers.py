@@ -0,0 +1,244 @@
+"""
+Output formats for card records.
+
+Writers take one card at a time, so a single pass over the cards can feed several outputs.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import pathlib
+import textwrap
+from collections.abc import Iterable
+from typing import TextIO
+
+from obsidianki.api import CARD_COLUMNS
+
+
+class CardWriter:
+    """
+    Base class for writers. Use as a context manager, or call close() when done and abort() if
+    something went wrong.
+    """
+
+    def write(self, card: dict[str, str]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        """
+        Stop writing without finishing the output.
+        """
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class CsvWriter(CardWriter):
+    """
+    Write cards as CSV rows. Leave the header off files for Anki, or it will make a flashcard out of it.
+    """
+
+    def __init__(self, stream: TextIO, header: bool = False, close_stream: bool = False):
+        self.stream = stream
+        self.close_stream = close_stream
+        self.writer = csv.DictWriter(stream, fieldnames=CARD_COLUMNS, lineterminator="\n")
+        if header:
+            self.writer.writeheader()
+
+    def write(self, card: dict[str, str]) -> None:
+        self.writer.writerow(card)
+
+    def close(self) -> None:
+        if self.close_stream:
+            self.stream.close()
+
+    def abort(self) -> None:
+        self.close()
+
+
+class JsonWriter(CardWriter):
+    """
+    Write cards as a pretty-printed JSON list, one record at a time.
+    """
+
+    def __init__(self, stream: TextIO, close_stream: bool = False):
+        self.stream = stream
+        self.close_stream = close_stream
+        self.count = 0
+
+    def write(self, card: dict[str, str]) -> None:
+        self.stream.write("[\n" if self.count == 0 else ",\n")
+        self.stream.write(textwrap.indent(json.dumps(card, indent=4), "    "))
+        self.count += 1
+
+    def close(self) -> None:
+        self.stream.write("[]" if self.count == 0 else "\n]")
+        self.stream.write("\n")
+        if self.close_stream:
+            self.stream.close()
+
+    def abort(self) -> None:
+        if self.close_stream:
+            self.stream.close()
+
+
+class ApkgWriter(CardWriter):
+    """
+    Write cards to an Anki package. Requires the optional genanki dependency.
+    """
+
+    def __init__(self, path: str | os.PathLike, deck_name: str | None = None):
+        try:
+            import genanki
+        except ImportError as e:
+            raise ImportError("Writing .apkg files requires genanki: pip install plisdku-obsidianki[apkg]") from e
+
+        self.genanki = genanki
+        self.path = pathlib.Path(path)
+        deck_name = deck_name or self.path.stem
+
+        self.model = genanki.Model(
+            _stable_id("obsidianki model"),
+            "Obsidianki",
+            fields=[{"name": column} for column in CARD_COLUMNS],
+            templates=[
+                {
+                    "name": "Card 1",
+                    "qfmt": "{{Front}}",
+                    "afmt": '{{FrontSide}}<hr id="answer">{{Back}}',
+                }
+            ],
+        )
+        self.deck = genanki.Deck(_stable_id(deck_name), deck_name)
+
+    def write(self, card: dict[str, str]) -> None:
+        fields = [card[column] for column in CARD_COLUMNS]
+        # The back has a random emoji in it, so identify notes by the front and reference only.
+        guid = self.genanki.guid_for(card["Front"], card["Reference"])
+        self.deck.add_note(self.genanki.Note(model=self.model, fields=fields, guid=guid))
+
+    def close(self) -> None:
+        self.genanki.Package(self.deck).write_to_file(self.path)
+
+    def abort(self) -> None:
+        # Nothing has been written to disk yet, so there is nothing to clean up.
+        pass
+
+
+class ReplacingWriter(CardWriter):
+    """
+    Write to a temporary file next to path and move it into place on close(), so an existing file is
+    left alone if writing is aborted.
+
+    Args:
+        path: the final output file
+        make_writer: function taking the temporary path and returning the writer for it
+    """
+
+    def __init__(self, path: str | os.PathLike, make_writer):
+        self.path = pathlib.Path(path)
+        # Opened normally rather than with tempfile, so the output gets the usual permissions.
+        self.tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.writer = make_writer(self.tmp_path)
+        except BaseException:
+            self.tmp_path.unlink(missing_ok=True)
+            raise
+
+    def write(self, card: dict[str, str]) -> None:
+        self.writer.write(card)
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except BaseException:
+            self.tmp_path.unlink(missing_ok=True)
+            raise
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        try:
+            self.writer.abort()
+        finally:
+            self.tmp_path.unlink(missing_ok=True)
+
+
+FORMATS = {".csv": "csv", ".json": "json", ".apkg": "apkg"}
+
+
+def check_output_path(path: str | os.PathLike) -> None:
+    """
+    Raise ValueError if the output format can't be chosen from the file extension.
+    """
+    path = pathlib.Path(path)
+    if path.suffix.lower() not in FORMATS:
+        raise ValueError(f"Unknown output format for {path}, expected one of {', '.join(FORMATS)}")
+
+
+def open_writer(path: str | os.PathLike) -> CardWriter:
+    """
+    Open a writer for the given file, choosing the format from its extension.
+
+    The file is only replaced when the writer is closed; aborting leaves any existing file untouched.
+    """
+    check_output_path(path)
+    path = pathlib.Path(path)
+    fmt = FORMATS[path.suffix.lower()]
+
+    if fmt == "csv":
+        return ReplacingWriter(
+            path, lambda tmp_path: CsvWriter(open(tmp_path, "w", encoding="utf-8", newline=""), close_stream=True)
+        )
+    elif fmt == "json":
+        return ReplacingWriter(
+            path, lambda tmp_path: JsonWriter(open(tmp_path, "w", encoding="utf-8"), close_stream=True)
+        )
+    else:
+        return ReplacingWriter(path, lambda tmp_path: ApkgWriter(tmp_path, deck_name=path.stem))
+
+
+def write_cards(cards: Iterable[dict[str, str]], writers: list[CardWriter]) -> int:
+    """
+    Send each card to every writer, then close them. If anything goes wrong, the writers not yet
+    closed are aborted instead, so no partial output is left behind.
+
+    Returns:
+        number of cards written
+    """
+    count = 0
+    try:
+        for card in cards:
+            for writer in writers:
+                writer.write(card)
+            count += 1
+    except BaseException:
+        for writer in writers:
+            writer.abort()
+        raise
+
+    for idx, writer in enumerate(writers):
+        try:
+            writer.close()
+        except BaseException:
+            for remaining in writers[idx + 1 :]:
+                remaining.abort()
+            raise
+    return count
+
+
+def _stable_id(name: str) -> int:
+    """
+    Anki model and deck IDs are 31 bit. Derive them from the name so re-imports update in place.
+    """
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=4).digest(), "little") >> 1
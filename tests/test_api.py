@@ -0,0 +1,101 @@
+import pathlib
+import random
+from textwrap import dedent
+
+import pytest
+
+from obsidianki.api import CARD_COLUMNS, convert_vault, iter_cards, iter_cards_text
+from obsidianki.my_emoji import load_emoji
+
+TEXT = dedent(
+    r"""
+:flashcard:
+What is $x$?
+A: A variable
+R: Algebra 101
+C: 1
+P: 3
+X: Extra info
+::
+:flashcard:
+✅ Already learned
+A: Yes
+::
+:flashcard:
+Next question
+A: Next answer
+P: 4
+::
+"""
+)
+
+
+def test_iter_cards_records():
+    cards = list(iter_cards_text(TEXT, rng=random.Random(0)))
+
+    assert len(cards) == 2
+    assert all(tuple(card) == CARD_COLUMNS for card in cards)
+    assert r"\(x\)" in cards[0]["Front"]
+    assert "A variable" in cards[0]["Back"]
+    assert "Extra info" in cards[0]["Back"]
+    assert any(emoji in cards[0]["Back"] for emoji in load_emoji())
+
+
+def test_iter_cards_carryover():
+    cards = list(iter_cards_text(TEXT))
+
+    # Reference and chapter carry over; page is overridden.
+    assert cards[1]["Reference"] == "Algebra 101"
+    assert cards[1]["Chapter"] == "1"
+    assert cards[1]["Page"] == "4"
+
+
+def test_iter_cards_include_checked():
+    cards = list(iter_cards_text(TEXT, include_checked=True))
+    assert len(cards) == 3
+    assert "✅" in cards[1]["Front"]
+
+
+def test_iter_cards_is_lazy():
+    cards = iter_cards_text(TEXT + ":flashcard:\nUnclosed $math\n::\n")
+    assert next(cards)["Reference"] == "Algebra 101"
+
+
+def test_iter_cards_path(tmp_path: pathlib.Path):
+    path = tmp_path / "note.md"
+    path.write_text(TEXT, encoding="utf-8")
+
+    assert len(list(iter_cards(path))) == 2
+
+    assert list(iter_cards(str(path), rng=random.Random(0))) == list(iter_cards_text(TEXT, rng=random.Random(0)))
+
+    with pytest.raises(FileNotFoundError):
+        iter_cards(tmp_path / "missing.md")
+
+
+def test_convert_vault(tmp_path: pathlib.Path):
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "a.md").write_text(TEXT, encoding="utf-8")
+    (tmp_path / "b.md").write_text(":flashcard:\nQ2\nA: A2\n::\n", encoding="utf-8")
+    (tmp_path / "ignored.txt").write_text(TEXT, encoding="utf-8")
+    (tmp_path / ".obsidian").mkdir()
+    (tmp_path / ".obsidian" / "c.md").write_text(TEXT, encoding="utf-8")
+
+    (tmp_path / "legacy.md").write_text("Book: Old\nQ: Q3\nA: A3\n", encoding="utf-8")
+
+    results = list(convert_vault(tmp_path))
+
+    assert [path.name for path, _ in results] == ["b.md", "legacy.md", "a.md", "a.md"]
+    # Carry-over fields don't leak between files
+    assert results[0][1]["Reference"] == ""
+    assert results[1][1]["Reference"] == "Old"
+
+
+def test_convert_vault_workers(tmp_path: pathlib.Path):
+    for idx in range(4):
+        (tmp_path / f"{idx}.md").write_text(TEXT, encoding="utf-8")
+
+    serial = list(convert_vault(tmp_path, rng=random.Random(1)))
+    parallel = list(convert_vault(tmp_path, rng=random.Random(1), workers=2))
+
+    assert parallel == serial
@@ -6,9 +6,12 @@ import pytest
 from obsidianki.convert import (
     FlashcardExtractionError,
     convert_math,
+    detect_dialect,
     extract_flashcard_blocks,
+    extract_legacy_fields,
     find_dollar_math_substrings,
     get_flashcard_fields,
+    iter_flashcard_fields,
 )
 
 
@@ -126,3 +129,47 @@ def test_convert_math():
     assert convert_math("$x < y$") == r"\(x &lt; y\)"
     assert convert_math("$x & y$") == r"\(x &amp; y\)"
     assert convert_math("$$x\n+\ny$$") == "\\[x<br>\n+<br>\ny\\]"
+
+
+LEGACY_TEXT = dedent(
+    r"""
+Book: Orthogonal Polynomials
+Chapter: 3
+
+**Q**: What is $P_0(x)$?
+**A**: 1
+Page: 12
+Tags: #math
+
+✅ Q: What is $P_1(x)$?
+A: $x$
+AA: Legendre
+Q: Third?
+A: Yes
+Chapter: 4
+"""
+)
+
+
+def test_detect_dialect():
+    assert detect_dialect(LEGACY_TEXT) == "legacy"
+    assert detect_dialect("Intro\n:flashcard:\nQ\nA: x\n::\n") == "flashcard"
+    assert detect_dialect("Nothing to see here.") == "flashcard"
+
+
+def test_extract_legacy_fields():
+    cards = extract_legacy_fields(LEGACY_TEXT)
+
+    assert cards == [
+        {"R": "Orthogonal Polynomials", "C": "3", "Q": "What is $P_0(x)$?", "A": "1", "P": "12"},
+        {"R": "Orthogonal Polynomials", "C": "3", "P": "12", "Q": "✅ What is $P_1(x)$?", "A": "$x$", "X": "Legendre"},
+        {"R": "Orthogonal Polynomials", "C": "4", "P": "12", "Q": "Third?", "A": "Yes"},
+    ]
+
+
+def test_iter_flashcard_fields_dialects():
+    assert list(iter_flashcard_fields(LEGACY_TEXT)) == extract_legacy_fields(LEGACY_TEXT)
+    assert list(iter_flashcard_fields(LEGACY_TEXT, dialect="flashcard")) == []
+
+    with pytest.raises(ValueError):
+        list(iter_flashcard_fields(LEGACY_TEXT, dialect="unknown"))
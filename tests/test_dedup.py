@@ -0,0 +1,114 @@
+import pathlib
+
+from obsidianki.dedup import DuplicateIndex, estimate_similarity, exact_hash, minhash_signature, normalize_text
+
+NOTE = """
+:flashcard:
+What is the capital of France?
+A: Paris
+::
+:flashcard:
+What is the derivative of $\\sin(x)$?
+A: $\\cos(x)$
+::
+"""
+
+OTHER_NOTE = """
+:flashcard:
+what is the capital of **France**
+A: Paris.
+::
+:flashcard:
+What's the derivative of $\\sin x$?
+A: $\\cos x$
+::
+:flashcard:
+Who wrote War and Peace?
+A: Tolstoy
+::
+"""
+
+
+def test_normalize_text():
+    assert normalize_text("What is **$x$**?\n\n  ✅ OK") == "what is x ok"
+    assert exact_hash("What is the capital of France?") == exact_hash("what is the capital of **France**")
+
+
+def test_minhash_similarity():
+    sig1 = minhash_signature("What is the derivative of sin(x)? cos(x)")
+    sig2 = minhash_signature("What's the derivative of sin x? cos x")
+    sig3 = minhash_signature("Who wrote War and Peace? Tolstoy")
+
+    assert estimate_similarity(sig1, sig1) == 1.0
+    assert estimate_similarity(sig1, sig2) > 0.5
+    assert estimate_similarity(sig1, sig3) < 0.3
+
+
+def test_duplicate_clusters(tmp_path: pathlib.Path):
+    (tmp_path / "a.md").write_text(NOTE, encoding="utf-8")
+    (tmp_path / "b.md").write_text(OTHER_NOTE, encoding="utf-8")
+
+    index = DuplicateIndex()
+    index.update_vault(tmp_path)
+    clusters = index.clusters(threshold=0.5)
+
+    questions = sorted(sorted(card.question for card in cluster) for cluster in clusters)
+    assert questions == [
+        ["What is the capital of France?", "what is the capital of **France**"],
+        ["What is the derivative of $\\sin(x)$?", "What's the derivative of $\\sin x$?"],
+    ]
+
+
+def test_incremental_update(tmp_path: pathlib.Path):
+    (tmp_path / "a.md").write_text(NOTE, encoding="utf-8")
+    (tmp_path / "b.md").write_text(OTHER_NOTE, encoding="utf-8")
+    index_path = tmp_path / "index.json"
+
+    index = DuplicateIndex()
+    assert len(index.update_vault(tmp_path)) == 2
+    index.save(index_path)
+
+    index = DuplicateIndex.load(index_path)
+    assert index.update_vault(tmp_path) == []
+
+    (tmp_path / "b.md").write_text(":flashcard:\nSomething else\nA: entirely\n::\n", encoding="utf-8")
+    (tmp_path / "a.md").unlink()
+    assert index.update_vault(tmp_path) == [str(tmp_path / "b.md")]
+    assert [card.question for card in index.cards()] == ["Something else"]
+    assert index.clusters() == []
+
+
+def test_many_identical_cards():
+    index = DuplicateIndex()
+    index.update_file("a.md", ":flashcard:\nYes\nA: No\n::\n" * 3000)
+    index.update_file("b.md", ":flashcard:\nQuestion\n::\n" * 3000)
+
+    clusters = index.clusters()
+    assert sorted(len(cluster) for cluster in clusters) == [3000, 3000]
+
+
+def test_update_vault_skips_bad_files(tmp_path: pathlib.Path):
+    (tmp_path / "a.md").write_text(NOTE, encoding="utf-8")
+    (tmp_path / "b.md").write_text(":flashcard:\nUnclosed\n", encoding="utf-8")
+    (tmp_path / "c.md").write_bytes(b":flashcard:\n\xff\xfe\n::\n")
+
+    index = DuplicateIndex()
+    assert index.update_vault(tmp_path) == [str(tmp_path / "a.md")]
+    assert list(index.errors) == [str(tmp_path / "b.md"), str(tmp_path / "c.md")]
+    assert len(index.cards()) == 2
+
+
+def test_load_bad_index(tmp_path: pathlib.Path):
+    index_path = tmp_path / "index.json"
+    index_path.write_text('{"version": 1, "keys": ["Q"], "fil', encoding="utf-8")
+
+    index = DuplicateIndex.load(index_path, keys=("Q",))
+    assert index.files == {}
+    assert index.keys == ("Q",)
+
+    index.update_file("a.md", NOTE)
+    index.save(index_path)
+    assert list(tmp_path.iterdir()) == [index_path]
+
+    assert len(DuplicateIndex.load(index_path).cards()) == 2
+    assert DuplicateIndex.load(index_path, keys=("Q", "A")).files == {}
@@ -0,0 +1,149 @@
+import io
+import json
+import pathlib
+
+import pytest
+
+from obsidianki.__main__ import main
+from obsidianki.convert import FlashcardExtractionError
+from obsidianki.writers import CsvWriter, JsonWriter, open_writer, write_cards
+
+CARDS = [
+    {"Front": "<p>Q1, with a comma</p>\n", "Back": "<p>A1 ✨</p>\n", "Reference": "R", "Chapter": "1", "Page": "2"},
+    {"Front": "<p>Q2</p>\n", "Back": "<p>A2</p>\n", "Reference": "", "Chapter": "", "Page": ""},
+]
+
+
+def test_json_writer_matches_json_dumps():
+    stream = io.StringIO()
+    assert write_cards(CARDS, [JsonWriter(stream)]) == 2
+    assert stream.getvalue() == json.dumps(CARDS, indent=4) + "\n"
+
+    stream = io.StringIO()
+    write_cards([], [JsonWriter(stream)])
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_csv_writer():
+    stream = io.StringIO()
+    write_cards(CARDS, [CsvWriter(stream, header=True)])
+    lines = stream.getvalue().split("\n")
+    assert lines[0] == "Front,Back,Reference,Chapter,Page"
+    assert lines[1] == '"<p>Q1, with a comma</p>'
+
+
+def test_fan_out(tmp_path: pathlib.Path):
+    paths = [tmp_path / "cards.csv", tmp_path / "cards.json"]
+    write_cards(iter(CARDS), [open_writer(path) for path in paths])
+
+    assert "Front" not in paths[0].read_text(encoding="utf-8")
+    assert json.loads(paths[1].read_text(encoding="utf-8")) == CARDS
+
+
+def test_apkg_writer(tmp_path: pathlib.Path):
+    pytest.importorskip("genanki")
+
+    path = tmp_path / "deck.apkg"
+    write_cards(CARDS, [open_writer(path)])
+    assert path.stat().st_size > 0
+
+
+def test_unknown_format(tmp_path: pathlib.Path):
+    with pytest.raises(ValueError):
+        open_writer(tmp_path / "cards.txt")
+
+
+def test_failed_write_keeps_existing_files(tmp_path: pathlib.Path):
+    paths = [tmp_path / "cards.csv", tmp_path / "cards.json"]
+    for path in paths:
+        path.write_text("old", encoding="utf-8")
+
+    def failing_cards():
+        yield CARDS[0]
+        raise FlashcardExtractionError("bad note")
+
+    with pytest.raises(FlashcardExtractionError):
+        write_cards(failing_cards(), [open_writer(path) for path in paths])
+
+    assert [path.read_text(encoding="utf-8") for path in paths] == ["old", "old"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cards.csv", "cards.json"]
+
+
+def test_failed_write_skips_apkg(tmp_path: pathlib.Path):
+    pytest.importorskip("genanki")
+
+    def failing_cards():
+        yield CARDS[0]
+        raise FlashcardExtractionError("bad note")
+
+    with pytest.raises(FlashcardExtractionError):
+        write_cards(failing_cards(), [open_writer(tmp_path / "deck.apkg")])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_apkg_guid_ignores_back(tmp_path: pathlib.Path):
+    pytest.importorskip("genanki")
+
+    writer = open_writer(tmp_path / "deck.apkg")
+    writer.write(CARDS[0])
+    writer.write({**CARDS[0], "Back": "<p>A1 🎉</p>\n"})
+    notes = writer.writer.deck.notes
+    assert notes[0].guid == notes[1].guid
+    writer.abort()
+
+
+def test_main_rejects_unknown_format_before_writing(tmp_path: pathlib.Path, monkeypatch):
+    note = tmp_path / "note.md"
+    note.write_text(":flashcard:\nQ\nA: A\n::\n", encoding="utf-8")
+    existing = tmp_path / "old.json"
+    existing.write_text("old", encoding="utf-8")
+
+    monkeypatch.setattr("sys.argv", ["obsidianki", str(note), "-o", str(existing), "-o", str(tmp_path / "x.txt")])
+    with pytest.raises(SystemExit):
+        main()
+
+    assert existing.read_text(encoding="utf-8") == "old"
+
+
+def test_failed_close_aborts_remaining_writers(tmp_path: pathlib.Path):
+    writers = [open_writer(tmp_path / "x.csv"), open_writer(tmp_path / "y.json")]
+
+    original_close = writers[0].writer.close
+
+    def failing_close():
+        original_close()
+        raise OSError("disk full")
+
+    writers[0].writer.close = failing_close
+
+    with pytest.raises(OSError):
+        write_cards(CARDS, writers)
+
+    assert list(tmp_path.iterdir()) == []
+    assert writers[1].writer.stream.closed
+
+
+def test_main_writes_several_outputs(tmp_path: pathlib.Path, monkeypatch):
+    note = tmp_path / "note.md"
+    note.write_text(":flashcard:\nQ\nA: A\n::\n", encoding="utf-8")
+
+    monkeypatch.setattr("sys.argv", ["obsidianki", str(note), "-o", "-o", str(tmp_path / "note.json")])
+    main()
+
+    assert "Q" in (tmp_path / "note.csv").read_text(encoding="utf-8")
+    assert len(json.loads((tmp_path / "note.json").read_text(encoding="utf-8"))) == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["note.csv", "note.json", "note.md"]
+
+
+@pytest.mark.parametrize("outputs", [["-o", "{dir}/a.csv", "-o", "{dir}/a.csv"], ["-o", "-o", "{dir}/note.csv"]])
+def test_main_rejects_duplicate_outputs(tmp_path: pathlib.Path, monkeypatch, outputs):
+    note = tmp_path / "note.md"
+    note.write_text(":flashcard:\nQ\nA: A\n::\n", encoding="utf-8")
+
+    outputs = [arg.format(dir=tmp_path) for arg in outputs]
+    monkeypatch.setattr("sys.argv", ["obsidianki", str(note), *outputs])
+    with pytest.raises(SystemExit):
+        main()
+
+    assert list(tmp_path.iterdir()) == [note]